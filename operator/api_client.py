@@ -0,0 +1,46 @@
+from kubernetes import client
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # Fast JSON decoding is optional
+    orjson = None
+
+# HTTP connections kept per API host, the client library default is 4 x CPUs
+DEFAULT_CONNECTION_POOL_MAXSIZE = 64
+
+def build_api_client(connection_pool_maxsize: int = DEFAULT_CONNECTION_POOL_MAXSIZE) -> client.ApiClient:
+    """Build the ApiClient shared by every API group of the operator
+    
+    Transient API server errors and throttling are retried by urllib3 for
+    idempotent requests.
+    """
+    cfg = client.Configuration.get_default_copy()
+    cfg.connection_pool_maxsize = connection_pool_maxsize
+    # raise_on_status=False hands the last response back, so callers still
+    # see an ApiException with its status once retries run out
+    cfg.retries = Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504),
+                        raise_on_status=False)
+    return FastJSONApiClient(cfg)
+
+class FastJSONApiClient(client.ApiClient):
+    """ApiClient decoding JSON responses with orjson when it is installed"""
+
+    def deserialize(self, response_text, response_type, content_type=None):
+        if orjson is None or not response_text or not _is_json(content_type):
+            return super().deserialize(response_text, response_type, content_type)
+
+        try:
+            data = orjson.loads(response_text)
+        except orjson.JSONDecodeError:
+            # Let the base class report or pass through what is not JSON
+            return super().deserialize(response_text, response_type, content_type)
+
+        return self._ApiClient__deserialize(data, response_type)
+
+def _is_json(content_type) -> bool:
+    """Whether a response content type (None when unknown) may hold JSON"""
+    if content_type is None:
+        return True
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or media_type.endswith("+json")
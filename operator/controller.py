@@ -1,125 +1,299 @@
+import functools
 import logging
-import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
 
 from kubernetes import client, watch
 from kubernetes.client.rest import ApiException
 
+from operator.api_client import build_api_client
 from operator.node_manager import NodeManager
-from operator.pod_manager import PodManager
+from operator.pod_manager import PodInfo, PodManager, compile_pdb, pod_to_info
 from operator.health_checker import HealthChecker
+from operator.informer import (
+    NAMESPACE_INDEX, NODE_NAME_INDEX, ResourceCache, index_by_namespace, index_by_node_name
+)
+from operator.rate_limiter import TokenBucket, exponential_backoff
 
 logger = logging.getLogger(__name__)
 
+# Upper bound of spec.targetNodes.maxConcurrentNodes in the CRD
+MAX_CONCURRENT_NODES = 10
+
+# Label mirroring status.phase so the API server can filter NodeRefreshes
+PHASE_LABEL = "operations.example.com/phase"
+# NodeRefreshes that may need work; also matches objects not yet labelled
+ACTIVE_SELECTOR = f"{PHASE_LABEL} notin (Completed)"
+
+@functools.lru_cache(maxsize=256)
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an RFC 3339 status timestamp into an aware datetime"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+class OperationState:
+    """In-memory state of one Pending or Running NodeRefresh operation"""
+    
+    __slots__ = ('resource_version', 'current_nodes', 'processed_nodes', 'failed_nodes')
+    
+    def __init__(self, resource_version: Optional[str], status: dict):
+        self.resource_version = resource_version
+        self.current_nodes: List[str] = list(status.get('currentNodes') or [])
+        self.processed_nodes: List[str] = list(status.get('processedNodes') or [])
+        self.failed_nodes: List[dict] = list(status.get('failedNodes') or [])
+    
+    def to_status(self) -> dict:
+        """Node progress fields of the NodeRefresh status"""
+        return {
+            'currentNodes': self.current_nodes,
+            'processedNodes': self.processed_nodes,
+            'failedNodes': self.failed_nodes
+        }
+
 class NodeRefreshController:
-    def __init__(self, namespace: str):
+    def __init__(self, namespace: str, api_client: Optional[client.ApiClient] = None):
         self.namespace = namespace
-        self.custom_api = client.CustomObjectsApi()
-        self.core_v1 = client.CoreV1Api()
-        self.apps_v1 = client.AppsV1Api()
-        self.policy_v1 = client.PolicyV1Api()
         
-        self.node_manager = NodeManager(self.core_v1)
-        self.pod_manager = PodManager(self.core_v1, self.apps_v1, self.policy_v1)
-        self.health_checker = HealthChecker(self.core_v1)
+        # All API groups and managers share one ApiClient and its connection pool
+        self.api_client = api_client or build_api_client()
+        self.custom_api = client.CustomObjectsApi(self.api_client)
+        self.core_v1 = client.CoreV1Api(self.api_client)
+        self.apps_v1 = client.AppsV1Api(self.api_client)
+        self.policy_v1 = client.PolicyV1Api(self.api_client)
+        
+        # Shared informer caches for nodes, pods (by node) and PDBs (by namespace)
+        self.node_cache = ResourceCache(self.core_v1.list_node, "node")
+        self.pod_cache = ResourceCache(
+            self.core_v1.list_pod_for_all_namespaces, "pod",
+            indexers={NODE_NAME_INDEX: index_by_node_name},
+            transform=pod_to_info
+        )
+        self.pdb_cache = ResourceCache(
+            self.policy_v1.list_pod_disruption_budget_for_all_namespaces, "pdb",
+            indexers={NAMESPACE_INDEX: index_by_namespace},
+            transform=compile_pdb
+        )
+        
+        self.node_manager = NodeManager.from_api_client(
+            self.api_client, node_cache=self.node_cache, pod_cache=self.pod_cache
+        )
+        self.pod_manager = PodManager.from_api_client(
+            self.api_client, pod_cache=self.pod_cache, pdb_cache=self.pdb_cache
+        )
+        self.health_checker = HealthChecker(self.core_v1, self.pod_cache)
         
         # Track ongoing operations
-        self.ongoing_operations: Dict[str, dict] = {}
+        self.ongoing_operations: Dict[str, OperationState] = {}
+        
+        # Versions written by a status patch and then replaced by our own
+        # label patch; their watch events carry stale progress
+        self.superseded_versions: Dict[str, Set[str]] = {}
+        
+        # When to look again at NodeRefreshes waiting on a timer: the next
+        # cycle of Completed ones (filtered out of active lists and watches)
+        # and the retry backoff of Failed ones
+        self.requeue_times: Dict[str, datetime] = {}
+        
+        # Caps retries across all NodeRefreshes during failure storms
+        self.retry_limiter = TokenBucket(rate=10, burst=100)
+        
+        # Current time, captured once per reconcile
+        self._update_now()
+        
+        # Refreshes of a batch's nodes run concurrently
+        self.executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_NODES,
+                                           thread_name_prefix="node-refresh")
     
-    def reconcile_all(self):
-        """Reconcile all NodeRefresh custom resources"""
-        try:
-            # List all NodeRefresh objects across all namespaces
-            noderefreshes = self.custom_api.list_cluster_custom_object(
-                group="operations.example.com",
-                version="v1alpha1",
-                plural="noderefreshes"
-            )
+    def start(self):
+        """Start the informer caches"""
+        self.node_cache.start()
+        self.pod_cache.start()
+        self.pdb_cache.start()
+    
+    def stop(self):
+        """Stop the informer caches, node refresh and eviction workers"""
+        self.node_cache.stop()
+        self.pod_cache.stop()
+        self.pdb_cache.stop()
+        self.executor.shutdown()
+        self.pod_manager.close()
+    
+    def forget(self, noderefresh: dict):
+        """Drop tracking state for a deleted NodeRefresh"""
+        metadata = noderefresh['metadata']
+        key = f"{metadata['namespace']}/{metadata['name']}"
+        self.ongoing_operations.pop(key, None)
+        self.superseded_versions.pop(key, None)
+    
+    def list_noderefreshes(self, label_selector: Optional[str] = None) -> dict:
+        """List NodeRefresh objects across all namespaces"""
+        return self.custom_api.list_cluster_custom_object(
+            group="operations.example.com",
+            version="v1alpha1",
+            plural="noderefreshes",
+            label_selector=label_selector
+        )
+    
+    def due_requeues(self) -> List[dict]:
+        """Fetch NodeRefreshes whose requeue time has passed"""
+        now = datetime.now(timezone.utc)
+        due = []
+        
+        for key, requeue_time in list(self.requeue_times.items()):
+            if now < requeue_time:
+                continue
             
-            for nr in noderefreshes.get('items', []):
-                self.reconcile(nr)
-                
-        except ApiException as e:
-            logger.error(f"Failed to list NodeRefresh objects: {e}")
+            namespace, name = key.split('/', 1)
+            try:
+                due.append(self.custom_api.get_namespaced_custom_object(
+                    group="operations.example.com",
+                    version="v1alpha1",
+                    namespace=namespace,
+                    plural="noderefreshes",
+                    name=name
+                ))
+                self.requeue_times.pop(key, None)
+            except ApiException as e:
+                if e.status == 404:
+                    self.requeue_times.pop(key, None)
+                else:
+                    logger.error("Failed to get NodeRefresh %s: %s", key, e)
+        
+        return due
     
     def reconcile(self, noderefresh: dict):
         """Reconcile a single NodeRefresh resource"""
-        name = noderefresh['metadata']['name']
-        namespace = noderefresh['metadata']['namespace']
-        
-        logger.info(f"Reconciling NodeRefresh {namespace}/{name}")
+        metadata = noderefresh['metadata']
+        name = metadata['name']
+        namespace = metadata['namespace']
+        key = f"{namespace}/{name}"
         
         # Get current status
-        current_phase = noderefresh.get('status', {}).get('phase', 'Pending')
-        
-        if current_phase == 'Completed':
-            # Check if it's time for the next refresh cycle
-            if self._should_restart_cycle(noderefresh):
-                self._update_status(name, namespace, {
-                    'phase': 'Pending',
-                    'message': 'Starting new refresh cycle',
-                    'startTime': datetime.utcnow().isoformat() + 'Z',
-                    'completionTime': None,
-                    'processedNodes': [],
-                    'failedNodes': []
-                })
-            return
+        status = noderefresh.get('status', {})
+        current_phase = status.get('phase', 'Pending')
+        generation = metadata.get('generation')
         
-        if current_phase == 'Failed':
-            # Implement retry logic
-            if self._should_retry(noderefresh):
-                self._update_status(name, namespace, {
-                    'phase': 'Pending',
-                    'message': 'Retrying failed operation'
-                })
-            return
+        if current_phase in ('Pending', 'Running'):
+            # Skip the intermediate version between our status and label
+            # patches; the label patch's version follows with the same status
+            superseded = self.superseded_versions.get(key)
+            if superseded and metadata.get('resourceVersion') in superseded:
+                superseded.discard(metadata.get('resourceVersion'))
+                logger.debug("NodeRefresh %s version superseded by a later write, skipping", key)
+                return
+            
+            # Skip objects whose spec and status were already acted on, e.g.
+            # a resync delivering the version a watch event already did
+            state = self.ongoing_operations.get(key)
+            if (state is not None and
+                    generation == status.get('observedGeneration') and
+                    state.resource_version == metadata.get('resourceVersion')):
+                logger.debug("NodeRefresh %s unchanged since last reconcile, skipping", key)
+                return
+            
+            state = OperationState(metadata.get('resourceVersion'), status)
+            self.ongoing_operations[key] = state
+        else:
+            self.ongoing_operations.pop(key, None)
+        
+        logger.info("Reconciling NodeRefresh %s/%s", namespace, name)
+        self._update_now()
         
-        # Start or continue the refresh operation
-        if current_phase == 'Pending':
-            self._start_refresh_operation(name, namespace, noderefresh)
-        elif current_phase == 'Running':
-            self._continue_refresh_operation(name, namespace, noderefresh)
+        self.requeue_times.pop(key, None)
+        
+        # All status changes of this reconcile are written in a single patch
+        with self._status_patch(noderefresh) as patch:
+            if current_phase == 'Completed':
+                # Check if it's time for the next refresh cycle
+                if self._should_restart_cycle(noderefresh):
+                    patch.update({
+                        'phase': 'Pending',
+                        'message': 'Starting new refresh cycle',
+                        'startTime': self._now_iso,
+                        'completionTime': None,
+                        'processedNodes': [],
+                        'failedNodes': [],
+                        'retryCount': 0
+                    })
+                else:
+                    # Completed objects drop out of active lists, so remember
+                    # when to look at this one again
+                    next_refresh = self._next_refresh_time(noderefresh)
+                    if next_refresh is not None:
+                        self.requeue_times[key] = next_refresh
+                return
+            
+            if current_phase == 'Failed':
+                # Retry with exponential backoff, globally rate limited
+                if self._should_retry(noderefresh) and self.retry_limiter.try_acquire():
+                    patch.update({
+                        'phase': 'Pending',
+                        'message': 'Retrying failed operation',
+                        'retryCount': status.get('retryCount', 0) + 1
+                    })
+                else:
+                    self.requeue_times[key] = max(self._next_retry_time(noderefresh),
+                                                  self._now + timedelta(seconds=1))
+                return
+            
+            # Start or continue the refresh operation
+            if current_phase == 'Pending':
+                self._start_refresh_operation(name, namespace, noderefresh, patch)
+            elif current_phase == 'Running':
+                self._continue_refresh_operation(name, namespace, noderefresh, state, patch)
+    
+    def _update_now(self):
+        """Capture the current time used for this reconcile's checks and timestamps"""
+        self._now = datetime.now(timezone.utc)
+        self._now_iso = self._now.strftime('%Y-%m-%dT%H:%M:%SZ')
     
     def _should_restart_cycle(self, noderefresh: dict) -> bool:
         """Check if it's time to restart the refresh cycle (every 3 days)"""
+        next_refresh = self._next_refresh_time(noderefresh)
+        return next_refresh is not None and self._now >= next_refresh
+    
+    def _next_refresh_time(self, noderefresh: dict) -> Optional[datetime]:
+        """When the next refresh cycle is due, or None if not scheduled"""
         spec = noderefresh.get('spec', {})
         schedule = spec.get('schedule', {})
         
         if not schedule.get('enabled', False):
-            return False
+            return None
         
         interval_days = schedule.get('intervalDays', 3)
         completion_time = noderefresh.get('status', {}).get('completionTime')
         
         if not completion_time:
-            return True
+            return self._now
         
         try:
-            completion_dt = datetime.fromisoformat(completion_time.replace('Z', '+00:00'))
-            next_refresh = completion_dt + timedelta(days=interval_days)
-            return datetime.utcnow() >= next_refresh
+            completion_dt = _parse_timestamp(completion_time)
+            return completion_dt + timedelta(days=interval_days)
         except ValueError:
-            return True
+            return self._now
     
     def _should_retry(self, noderefresh: dict) -> bool:
         """Determine if a failed operation should be retried"""
+        return self._now >= self._next_retry_time(noderefresh)
+    
+    def _next_retry_time(self, noderefresh: dict) -> datetime:
+        """When a failed operation may be retried, backing off exponentially per retry"""
         status = noderefresh.get('status', {})
         failed_time = status.get('completionTime')
         
         if not failed_time:
-            return True
+            return self._now
         
         try:
-            failed_dt = datetime.fromisoformat(failed_time.replace('Z', '+00:00'))
-            # Retry after 1 hour
-            return datetime.utcnow() >= failed_dt + timedelta(hours=1)
+            failed_dt = _parse_timestamp(failed_time)
+            return failed_dt + exponential_backoff(status.get('retryCount', 0))
         except ValueError:
-            return True
+            return self._now
     
-    def _start_refresh_operation(self, name: str, namespace: str, noderefresh: dict):
+    def _start_refresh_operation(self, name: str, namespace: str, noderefresh: dict, patch: dict):
         """Start a new node refresh operation"""
-        logger.info(f"Starting refresh operation for {namespace}/{name}")
+        logger.info("Starting refresh operation for %s/%s", namespace, name)
         
         spec = noderefresh['spec']
         target_selector = spec['targetNodes']['selector']
@@ -129,78 +303,85 @@ class NodeRefreshController:
         target_nodes = self.node_manager.find_nodes_by_selector(target_selector)
         
         if not target_nodes:
-            self._update_status(name, namespace, {
+            patch.update({
                 'phase': 'Failed',
                 'message': 'No nodes found matching selector',
-                'completionTime': datetime.utcnow().isoformat() + 'Z'
+                'completionTime': self._now_iso
             })
             return
         
         # Initialize status
-        self._update_status(name, namespace, {
+        patch.update({
             'phase': 'Running',
             'currentNodes': target_nodes[:max_concurrent],
             'processedNodes': [],
             'failedNodes': [],
-            'startTime': datetime.utcnow().isoformat() + 'Z',
+            'startTime': self._now_iso,
             'message': f'Starting refresh of {len(target_nodes)} nodes'
         })
     
-    def _continue_refresh_operation(self, name: str, namespace: str, noderefresh: dict):
+    def _continue_refresh_operation(self, name: str, namespace: str, noderefresh: dict,
+                                    state: OperationState, patch: dict):
         """Continue an ongoing refresh operation"""
-        status = noderefresh.get('status', {})
-        current_nodes = status.get('currentNodes', [])
-        processed_nodes = status.get('processedNodes', [])
-        failed_nodes = status.get('failedNodes', [])
-        
         spec = noderefresh['spec']
         max_concurrent = spec['targetNodes'].get('maxConcurrentNodes', 1)
         target_selector = spec['targetNodes']['selector']
         
-        # Refresh current batch of nodes
-        for node_name in current_nodes[:]:  # Copy list for safe iteration
-            if self._refresh_node(name, namespace, node_name, spec):
-                processed_nodes.append(node_name)
-                current_nodes.remove(node_name)
-            else:
-                failed_nodes.append({
-                    'nodeName': node_name,
-                    'reason': 'Node refresh failed',
-                    'timestamp': datetime.utcnow().isoformat() + 'Z'
-                })
-                current_nodes.remove(node_name)
-        
-        # Add new nodes to current batch if we have capacity
+        processed_set = set(state.processed_nodes)
+        failed_set = {fn['nodeName'] for fn in state.failed_nodes}
+        
+        # Refresh current batch of nodes concurrently; duplicates and nodes
+        # already handled are never refreshed twice
+        batch = set(state.current_nodes) - processed_set - failed_set
+        futures = {
+            self.executor.submit(self._refresh_node, name, namespace, node_name, spec): node_name
+            for node_name in batch
+        }
+        
+        refreshed = {futures[future] for future in as_completed(futures) if future.result()}
+        failed = batch - refreshed
+        
+        # A batch can take minutes, so stamp its results with the time it ended
+        self._update_now()
+        
+        # Every node leaves the batch as either processed or failed
+        state.processed_nodes.extend(sorted(refreshed))
+        state.failed_nodes.extend({
+            'nodeName': node_name,
+            'reason': 'Node refresh failed',
+            'timestamp': self._now_iso
+        } for node_name in sorted(failed))
+        processed_set |= refreshed
+        failed_set |= failed
+        
+        # Fill the next batch from target nodes not handled yet
         all_target_nodes = self.node_manager.find_nodes_by_selector(target_selector)
-        remaining_nodes = [n for n in all_target_nodes 
-                         if n not in processed_nodes and n not in [fn['nodeName'] for fn in failed_nodes]]
+        handled = processed_set | failed_set
+        remaining_nodes = [n for n in all_target_nodes if n not in handled]
         
-        while current_nodes and len(current_nodes) < max_concurrent and remaining_nodes:
-            next_node = remaining_nodes.pop(0)
-            current_nodes.append(next_node)
+        state.current_nodes = remaining_nodes[:max_concurrent]
+        remaining_nodes = remaining_nodes[max_concurrent:]
         
         # Update status
-        new_status = {
-            'currentNodes': current_nodes,
-            'processedNodes': processed_nodes,
-            'failedNodes': failed_nodes
-        }
+        new_status = state.to_status()
         
         # Check if operation is complete
-        if not current_nodes and not remaining_nodes:
+        if not state.current_nodes and not remaining_nodes:
             new_status.update({
                 'phase': 'Completed',
-                'completionTime': datetime.utcnow().isoformat() + 'Z',
-                'message': f'Refresh completed. Processed: {len(processed_nodes)}, Failed: {len(failed_nodes)}'
+                'completionTime': self._now_iso,
+                'message': f'Refresh completed. Processed: {len(state.processed_nodes)}, '
+                           f'Failed: {len(state.failed_nodes)}'
             })
         else:
-            new_status['message'] = f'Processing {len(current_nodes)} nodes, {len(remaining_nodes)} remaining'
+            new_status['message'] = (f'Processing {len(state.current_nodes)} nodes, '
+                                     f'{len(remaining_nodes)} remaining')
         
-        self._update_status(name, namespace, new_status)
+        patch.update(new_status)
     
     def _refresh_node(self, name: str, namespace: str, node_name: str, spec: dict) -> bool:
         """Refresh a single node with zero downtime"""
-        logger.info(f"Refreshing node {node_name}")
+        logger.info("Refreshing node %s", node_name)
         
         max_pods_to_move = spec['podManagement'].get('maxPodsToMove', 3)
         min_healthy_pods = spec['podManagement'].get('minHealthyPods', 2)
@@ -208,122 +389,172 @@ class NodeRefreshController:
         readiness_timeout = spec['healthChecks'].get('readinessTimeout', 300)
         
         try:
-            # Step 1: Check if node is ready for refresh
-            if not self.node_manager.is_node_ready_for_refresh(node_name):
-                logger.warning(f"Node {node_name} is not ready for refresh")
+            # Step 1: Check if node is ready for refresh. This is the last check
+            # before the node is cordoned, so read it consistently
+            if not self.node_manager.is_node_ready_for_refresh(node_name, consistent=True):
+                logger.warning("Node %s is not ready for refresh", node_name)
                 return False
             
-            # Step 2: Get pods running on the node
+            # Step 2: Get pods running on the node. This runs for every node
+            # refreshed, so it must be served by the pod cache or a field
+            # selector on spec.nodeName, never by listing all pods.
             pods_on_node = self.pod_manager.get_pods_on_node(node_name)
             
             if not pods_on_node:
-                logger.info(f"No pods found on node {node_name}, skipping")
+                logger.info("No pods found on node %s, skipping", node_name)
                 return True
             
             # Step 3: Check Pod Disruption Budgets
             if not self.pod_manager.check_pdb_compliance(pods_on_node):
-                logger.warning(f"PDB check failed for node {node_name}")
+                logger.warning("PDB check failed for node %s", node_name)
                 return False
             
             # Step 4: Provision replacement node (in real scenario, this would trigger cloud provider API)
-            replacement_node = self.node_manager.provision_replacement_node(node_name)
+            replacement_node = self.node_manager.provision_replacement_node(
+                node_name, spec['targetNodes']['selector']
+            )
             if not replacement_node:
-                logger.error(f"Failed to provision replacement node for {node_name}")
+                logger.error("Failed to provision replacement node for %s", node_name)
                 return False
             
-            logger.info(f"Replacement node {replacement_node} provisioned")
+            logger.info("Replacement node %s provisioned", replacement_node)
             
-            # Step 5: Safely migrate pods
-            successful_migrations = 0
-            failed_migrations = 0
+            # Step 5: Safely migrate pods. Evictions run one at a time per
+            # namespace so PDBs are re-evaluated between them, then readiness
+            # of the rescheduled pods is awaited in parallel
+            pods_to_move = pods_on_node[:max_pods_to_move]
+            logger.info("Migrating %s pods from %s to %s", len(pods_to_move), node_name, replacement_node)
             
-            for pod in pods_on_node[:max_pods_to_move]:
-                if self._migrate_pod(pod, node_name, replacement_node, readiness_timeout):
-                    successful_migrations += 1
-                else:
-                    failed_migrations += 1
-                    # If too many failures, abort node refresh
-                    if failed_migrations > (len(pods_on_node) - min_healthy_pods):
-                        logger.error(f"Too many pod migration failures on node {node_name}")
-                        # Rollback: move pods back to original node
-                        self._rollback_migrations(pods_on_node, node_name)
-                        return False
+            # Cordon the source node so evicted pods are not scheduled back onto it
+            self.node_manager.cordon_node(node_name)
+            
+            # In a real scenario deployment controllers recreate the evicted
+            # pods on the replacement node
+            evicted = self.pod_manager.evict_pods(pods_to_move)
+            
+            with ThreadPoolExecutor(max_workers=len(pods_to_move)) as pool:
+                results = list(pool.map(
+                    lambda pod: self._wait_for_migrated_pod(pod, evicted, readiness_timeout),
+                    pods_to_move
+                ))
+            
+            successful_migrations = sum(results)
+            failed_migrations = len(results) - successful_migrations
+            
+            # If too many failures, abort node refresh
+            if failed_migrations > (len(pods_on_node) - min_healthy_pods):
+                logger.error("Too many pod migration failures on node %s", node_name)
+                # Rollback: move pods back to original node
+                self._rollback_migrations(pods_on_node, node_name)
+                return False
             
             # Step 6: Drain the original node
             if successful_migrations >= min_healthy_pods:
                 if self.node_manager.safely_drain_node(node_name, drain_timeout):
-                    logger.info(f"Successfully refreshed node {node_name}")
+                    logger.info("Successfully refreshed node %s", node_name)
                     return True
                 else:
-                    logger.error(f"Failed to drain node {node_name}")
+                    logger.error("Failed to drain node %s", node_name)
             
             return False
             
         except Exception as e:
-            logger.error(f"Error refreshing node {node_name}: {e}")
+            logger.error("Error refreshing node %s: %s", node_name, e)
             return False
     
-    def _migrate_pod(self, pod: dict, source_node: str, target_node: str, timeout: int) -> bool:
-        """Migrate a single pod to a new node"""
-        pod_name = pod['metadata']['name']
-        pod_namespace = pod['metadata']['namespace']
-        
-        logger.info(f"Migrating pod {pod_namespace}/{pod_name} from {source_node} to {target_node}")
+    def _wait_for_migrated_pod(self, pod: PodInfo, evicted: Dict[str, bool], timeout: int) -> bool:
+        """Wait for an evicted pod to be rescheduled and healthy"""
+        if not evicted.get(f"{pod.namespace}/{pod.name}"):
+            return False
         
         try:
-            # Step 1: Cordon the source node to prevent new pods
-            self.node_manager.cordon_node(source_node)
-            
-            # Step 2: Create pod on target node (in real scenario, this would be handled by deployment controllers)
-            # For demonstration, we'll delete and let the controller recreate on new node
-            if self.pod_manager.evict_pod(pod_name, pod_namespace):
-                # Wait for pod to be rescheduled and healthy
-                return self.health_checker.wait_for_pod_ready(pod_name, pod_namespace, timeout)
-            
-            return False
-            
+            return self.health_checker.wait_for_pod_ready(pod.name, pod.namespace, timeout)
         except Exception as e:
-            logger.error(f"Failed to migrate pod {pod_namespace}/{pod_name}: {e}")
+            logger.error("Failed to migrate pod %s/%s: %s", pod.namespace, pod.name, e)
             return False
     
-    def _rollback_migrations(self, pods: List[dict], original_node: str):
+    def _rollback_migrations(self, pods: List[PodInfo], original_node: str):
         """Rollback pod migrations in case of failure"""
-        logger.warning(f"Rolling back pod migrations to node {original_node}")
+        logger.warning("Rolling back pod migrations to node %s", original_node)
         
         for pod in pods:
             # In a real scenario, you would have backup of pod specs
             # For this example, we just log the rollback
-            logger.info(f"Would rollback pod {pod['metadata']['name']} to {original_node}")
+            logger.info("Would rollback pod %s to %s", pod.name, original_node)
+    
+    @contextmanager
+    def _status_patch(self, noderefresh: dict):
+        """Collect status changes in a dict and write them as one patch on exit"""
+        metadata = noderefresh['metadata']
+        name = metadata['name']
+        namespace = metadata['namespace']
+        
+        patch = {}
+        yield patch
+        
+        status_version = None
+        if patch:
+            status_version = self._update_status(name, namespace, patch, metadata.get('generation'))
+            if status_version is None:
+                return
+        
+        # Keep the phase label in sync so lists and watches can filter on it
+        phase = patch.get('phase', noderefresh.get('status', {}).get('phase', 'Pending'))
+        if (metadata.get('labels') or {}).get(PHASE_LABEL) != phase:
+            label_version = self._update_phase_label(name, namespace, phase)
+            
+            # Both writes produce a watch event carrying the new status; only
+            # the later one may be reconciled or the batch would run twice
+            if status_version is not None and label_version is not None:
+                self.superseded_versions.setdefault(f"{namespace}/{name}", set()).add(status_version)
     
-    def _update_status(self, name: str, namespace: str, status_updates: dict):
-        """Update the status of a NodeRefresh resource"""
+    def _update_status(self, name: str, namespace: str, status_updates: dict,
+                       generation: Optional[int] = None) -> Optional[str]:
+        """Update the status of a NodeRefresh resource
+        
+        Returns the resourceVersion written, or None if the update failed.
+        """
+        if generation is not None:
+            status_updates = dict(status_updates, observedGeneration=generation)
+        
         try:
-            # Get current resource
-            current = self.custom_api.get_namespaced_custom_object(
+            # Merge patch the status subresource with only the changed fields
+            updated = self.custom_api.patch_namespaced_custom_object_status(
                 group="operations.example.com",
                 version="v1alpha1",
                 namespace=namespace,
                 plural="noderefreshes",
-                name=name
+                name=name,
+                body={'status': status_updates},
+                _content_type="application/merge-patch+json"
             )
             
-            # Update status
-            if 'status' not in current:
-                current['status'] = {}
-            
-            current['status'].update(status_updates)
+            logger.debug("Updated status for %s/%s", namespace, name)
+            return updated['metadata']['resourceVersion']
             
-            # Apply update
-            self.custom_api.replace_namespaced_custom_object(
+        except ApiException as e:
+            logger.error("Failed to update status for %s/%s: %s", namespace, name, e)
+            # Reconcile this version again on its next delivery
+            self.ongoing_operations.pop(f"{namespace}/{name}", None)
+            return None
+    
+    def _update_phase_label(self, name: str, namespace: str, phase: str) -> Optional[str]:
+        """Mirror the phase of a NodeRefresh resource into its labels
+        
+        Returns the resourceVersion written, or None if the update failed.
+        """
+        try:
+            updated = self.custom_api.patch_namespaced_custom_object(
                 group="operations.example.com",
                 version="v1alpha1",
                 namespace=namespace,
                 plural="noderefreshes",
                 name=name,
-                body=current
+                body={'metadata': {'labels': {PHASE_LABEL: phase}}},
+                _content_type="application/merge-patch+json"
             )
-            
-            logger.debug(f"Updated status for {namespace}/{name}")
+            return updated['metadata']['resourceVersion']
             
         except ApiException as e:
-            logger.error(f"Failed to update status for {namespace}/{name}: {e}")
\ No newline at end of file
+            logger.error("Failed to update phase label for %s/%s: %s", namespace, name, e)
+            return None
\ No newline at end of file
@@ -1,52 +1,89 @@
 import logging
 import time
-from typing import List
+from typing import List, Optional
 
+from kubernetes import watch
 from kubernetes.client.rest import ApiException
 
+from operator.pod_manager import PodInfo
+
 logger = logging.getLogger(__name__)
 
 class HealthChecker:
-    def __init__(self, core_v1):
+    def __init__(self, core_v1, pod_cache=None):
         self.core_v1 = core_v1
+        self.pod_cache = pod_cache
     
     def wait_for_pod_ready(self, pod_name: str, namespace: str, timeout: int = 300) -> bool:
         """Wait for a pod to become ready"""
-        start_time = time.time()
+        if self.pod_cache is not None and self.pod_cache.has_synced():
+            # Re-checked on every pod cache change instead of polling
+            ready = self.pod_cache.wait_for(namespace, pod_name, self._pod_readiness, timeout)
+            
+            if ready is None:
+                logger.error("Timeout waiting for pod %s/%s to be ready", namespace, pod_name)
+                return False
+            
+            if ready:
+                logger.info("Pod %s/%s is ready", namespace, pod_name)
+            else:
+                logger.error("Pod %s/%s failed", namespace, pod_name)
+            return ready
         
-        while time.time() - start_time < timeout:
-            try:
-                pod = self.core_v1.read_namespaced_pod(pod_name, namespace)
-                
-                # Check if pod is running and ready
-                if pod.status.phase == "Running":
-                    # Check readiness conditions
-                    if all(condition.ready for condition in pod.status.conditions or [] 
-                           if condition.type == "Ready"):
-                        logger.info(f"Pod {namespace}/{pod_name} is ready")
+        # Without a cache, watch just this pod instead of polling it
+        w = watch.Watch()
+        deadline = time.time() + timeout
+        
+        try:
+            while time.time() < deadline:
+                for event in w.stream(
+                    self.core_v1.list_namespaced_pod,
+                    namespace,
+                    field_selector=f"metadata.name={pod_name}",
+                    timeout_seconds=max(1, int(deadline - time.time()))
+                ):
+                    # A deleted pod might be being rescheduled
+                    pod = None if event['type'] == 'DELETED' else event['object']
+                    ready = self._pod_readiness(pod)
+                    
+                    if ready:
+                        logger.info("Pod %s/%s is ready", namespace, pod_name)
                         return True
-                
-                # Check if pod failed
-                if pod.status.phase == "Failed":
-                    logger.error(f"Pod {namespace}/{pod_name} failed")
-                    return False
-                
-                logger.debug(f"Waiting for pod {namespace}/{pod_name} to be ready...")
-                time.sleep(5)
-                
-            except ApiException as e:
-                if e.status == 404:
-                    # Pod might not exist yet (being rescheduled)
-                    logger.debug(f"Pod {namespace}/{pod_name} not found yet, waiting...")
-                    time.sleep(5)
-                else:
-                    logger.error(f"Error checking pod {namespace}/{pod_name}: {e}")
-                    return False
+                    
+                    # Check if pod failed
+                    if ready is False:
+                        logger.error("Pod %s/%s failed", namespace, pod_name)
+                        return False
+                    
+                    logger.debug("Waiting for pod %s/%s to be ready...", namespace, pod_name)
+                    
+        except ApiException as e:
+            logger.error("Error checking pod %s/%s: %s", namespace, pod_name, e)
+            return False
+        finally:
+            w.stop()
         
-        logger.error(f"Timeout waiting for pod {namespace}/{pod_name} to be ready")
+        logger.error("Timeout waiting for pod %s/%s to be ready", namespace, pod_name)
         return False
     
-    def check_application_health(self, pods: List[dict]) -> bool:
+    def _pod_readiness(self, pod) -> Optional[bool]:
+        """True if the pod is running and ready, False if it failed, None while undecided"""
+        if pod is None:
+            # Pod might not exist yet (being rescheduled)
+            return None
+        
+        if pod.status.phase == "Failed":
+            return False
+        
+        if pod.status.phase == "Running" and any(
+            condition.type == "Ready" and condition.status == "True"
+            for condition in pod.status.conditions or []
+        ):
+            return True
+        
+        return None
+    
+    def check_application_health(self, pods: List[PodInfo]) -> bool:
         """Check overall application health"""
         # This would implement application-specific health checks
         # For example, checking endpoints, database connections, etc.
@@ -59,7 +96,7 @@ class HealthChecker:
         # Consider application healthy if majority of pods are healthy
         return healthy_pods >= len(pods) * 0.8  # 80% healthy
     
-    def _is_pod_healthy(self, pod: dict) -> bool:
+    def _is_pod_healthy(self, pod: PodInfo) -> bool:
         """Check if a specific pod is healthy"""
         # Implement pod-specific health checks
         # This could include:
@@ -69,15 +106,15 @@ class HealthChecker:
         # - Resource usage monitoring
         
         try:
-            pod_obj = self.core_v1.read_namespaced_pod(
-                pod['metadata']['name'],
-                pod['metadata']['namespace']
-            )
+            pod_obj = None
+            if self.pod_cache is not None and self.pod_cache.has_synced():
+                pod_obj = self.pod_cache.get(pod.namespace, pod.name)
+            
+            if pod_obj is None:
+                pod_obj = self.core_v1.read_namespaced_pod(pod.name, pod.namespace)
             
             # Basic health check - pod is running and ready
-            return (pod_obj.status.phase == "Running" and
-                   any(condition.ready for condition in pod_obj.status.conditions 
-                       if condition.type == "Ready"))
+            return self._pod_readiness(pod_obj) is True
                        
         except ApiException:
             return False
\ No newline at end of file
@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+logger = logging.getLogger(__name__)
+
+# Server-side timeout for a single watch request
+WATCH_TIMEOUT = 300
+
+# Index names understood by the indexers below
+NODE_NAME_INDEX = "nodeName"
+NAMESPACE_INDEX = "namespace"
+
+def index_by_node_name(obj) -> Optional[str]:
+    """Index pods by the node they are bound to"""
+    return obj.spec.node_name
+
+def index_by_namespace(obj) -> Optional[str]:
+    """Index namespaced objects by their namespace"""
+    return obj.metadata.namespace
+
+class ResourceCache:
+    """In-memory cache of one resource kind, kept current by a list + watch
+
+    indexers maps an index name to a function returning the index value of
+    an object (or None to leave it out), for lookups with by_index().
+    Index entries hold transform(obj) when a transform is given, so derived
+    forms of an object are built once per change rather than once per lookup.
+    Objects the transform maps to None are kept out of the indices.
+    """
+
+    def __init__(self, list_fn: Callable, kind: str,
+                 indexers: Optional[Dict[str, Callable]] = None,
+                 transform: Optional[Callable] = None):
+        self.list_fn = list_fn
+        self.kind = kind
+        self.indexers = indexers or {}
+        self.transform = transform
+
+        self._store: Dict[Tuple[Optional[str], str], object] = {}
+        self._indices: Dict[str, Dict[str, Dict[Tuple[Optional[str], str], object]]] = {
+            name: {} for name in self.indexers
+        }
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start the background list/watch thread"""
+        thread = threading.Thread(target=self._run, name=f"{self.kind}-informer", daemon=True)
+        thread.start()
+
+    def stop(self):
+        """Stop watching after the current event"""
+        self._stopped.set()
+
+    def has_synced(self) -> bool:
+        """Whether the initial list has been loaded"""
+        return self._synced.is_set()
+
+    def get(self, namespace: Optional[str], name: str):
+        """Get a cached object, or None if it does not exist"""
+        with self._lock:
+            return self._store.get((namespace, name))
+
+    def list(self) -> List:
+        """Get a snapshot of all cached objects"""
+        with self._lock:
+            return list(self._store.values())
+
+    def by_index(self, index_name: str, value: str) -> List:
+        """Get a snapshot of the (transformed) objects with the given index value"""
+        with self._lock:
+            return list(self._indices[index_name].get(value, {}).values())
+
+    def count_by_index(self, index_name: str, value: str) -> int:
+        """Count the cached objects with the given index value without copying them"""
+        with self._lock:
+            return len(self._indices[index_name].get(value, ()))
+
+    def wait_for(self, namespace: Optional[str], name: str, check: Callable, timeout: float):
+        """Wait until check(obj) returns a non-None result for a cached object
+
+        The check is re-evaluated whenever the cache changes and is passed None
+        while the object does not exist. Returns None on timeout.
+        """
+        return self.wait_until(lambda: check(self._store.get((namespace, name))), timeout)
+
+    def wait_until(self, check: Callable, timeout: float):
+        """Wait until check() returns a non-None result
+
+        The check is called with the cache lock held and re-evaluated whenever
+        the cache changes. Returns None on timeout.
+        """
+        deadline = time.time() + timeout
+
+        with self._changed:
+            while True:
+                result = check()
+                if result is not None:
+                    return result
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._changed.wait(remaining)
+
+    def _run(self):
+        """List once, then apply watch events until stopped"""
+        w = watch.Watch()
+        resource_version = None
+
+        while not self._stopped.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._relist()
+
+                for event in w.stream(
+                    self.list_fn,
+                    resource_version=resource_version,
+                    allow_watch_bookmarks=True,
+                    timeout_seconds=WATCH_TIMEOUT
+                ):
+                    if self._stopped.is_set():
+                        w.stop()
+                        break
+
+                    if event['type'] == 'BOOKMARK':
+                        # Bookmarks carry only a resourceVersion and are not deserialized
+                        resource_version = event['raw_object']['metadata']['resourceVersion']
+                        continue
+
+                    obj = event['object']
+                    resource_version = obj.metadata.resource_version
+                    self._apply(event['type'], obj)
+
+            except ApiException as e:
+                if e.status == 410:
+                    logger.info("%s watch expired, relisting", self.kind)
+                else:
+                    logger.error("Error watching %s objects: %s", self.kind, e)
+                    self._stopped.wait(5)
+                resource_version = None
+            except Exception as e:
+                logger.error("Error watching %s objects: %s", self.kind, e)
+                self._stopped.wait(5)
+
+    def _relist(self) -> str:
+        """Replace the cache contents with a fresh list"""
+        objects = self.list_fn()
+
+        with self._changed:
+            self._store = {self._key(obj): obj for obj in objects.items}
+            self._indices = {name: {} for name in self.indexers}
+            for key, obj in self._store.items():
+                self._index(key, obj)
+            self._changed.notify_all()
+
+        self._synced.set()
+        logger.info("Synced %s %s objects", len(objects.items), self.kind)
+        return objects.metadata.resource_version
+
+    def _apply(self, event_type: str, obj):
+        """Apply a single watch event to the cache"""
+        key = self._key(obj)
+
+        with self._changed:
+            old = self._store.pop(key, None)
+            if old is not None:
+                self._unindex(key, old)
+
+            if event_type != 'DELETED':
+                self._store[key] = obj
+                self._index(key, obj)
+            self._changed.notify_all()
+
+    def _index(self, key: Tuple[Optional[str], str], obj):
+        """Add an object to every index"""
+        entry = obj if self.transform is None else self.transform(obj)
+        if entry is None:
+            # Transformed away, nothing to index
+            return
+
+        for name, index_fn in self.indexers.items():
+            value = index_fn(obj)
+            if value is not None:
+                self._indices[name].setdefault(value, {})[key] = entry
+
+    def _unindex(self, key: Tuple[Optional[str], str], obj):
+        """Remove an object from every index"""
+        for name, index_fn in self.indexers.items():
+            value = index_fn(obj)
+            bucket = self._indices[name].get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._indices[name][value]
+
+    @staticmethod
+    def _key(obj) -> Tuple[Optional[str], str]:
+        return (obj.metadata.namespace, obj.metadata.name)
@@ -2,24 +2,36 @@
 
 import logging
 import logging.config
+import queue
 import signal
 import sys
 import time
-from threading import Event
+from threading import Event, Thread
 
 from kubernetes import client, config, watch
+from kubernetes.client.rest import ApiException
 
-from operator.controller import NodeRefreshController
+from operator.api_client import build_api_client
+from operator.controller import ACTIVE_SELECTOR, NodeRefreshController
 from operator.crd import ensure_crd_exists
 
 # Configure logging
 logging.config.fileConfig('config/logging.conf')
 logger = logging.getLogger(__name__)
 
+# Full relist interval guarding against missed watch events
+RESYNC_PERIOD = 300
+# Server-side timeout for a single watch request
+WATCH_TIMEOUT = 60
+# HTTP connections kept per API host; covers 10 concurrent nodes, their
+# parallel pod migrations and the watches
+CONNECTION_POOL_MAXSIZE = 64
+
 class Operator:
     def __init__(self, namespace=None):
         self.namespace = namespace or "node-refresh-operator"
         self.shutdown_event = Event()
+        self.events = queue.Queue()
         
         # Load kubeconfig
         try:
@@ -30,14 +42,73 @@ class Operator:
             except config.ConfigException:
                 raise RuntimeError("Could not load kubeconfig")
         
-        self.v1 = client.CoreV1Api()
-        self.custom_api = client.CustomObjectsApi()
-        self.controller = NodeRefreshController(self.namespace)
+        # One pooled client shared by every API group, sized for concurrent
+        # refreshes and watches
+        self.api_client = build_api_client(CONNECTION_POOL_MAXSIZE)
+        
+        self.v1 = client.CoreV1Api(self.api_client)
+        self.custom_api = client.CustomObjectsApi(self.api_client)
+        self.controller = NodeRefreshController(self.namespace, self.api_client)
         
     def signal_handler(self, signum, frame):
         logger.info("Received shutdown signal, gracefully shutting down...")
         self.shutdown_event.set()
     
+    def watch_noderefreshes(self):
+        """List and watch NodeRefresh objects, queueing every change for reconciliation"""
+        w = watch.Watch()
+        resource_version = None
+        next_resync = 0.0
+        label_selector = None
+        
+        while not self.shutdown_event.is_set():
+            try:
+                # Relist on startup, after the watch expired and periodically.
+                # Only the first list includes Completed objects; after that
+                # the controller requeues them when their next cycle is due.
+                if resource_version is None or time.time() >= next_resync:
+                    noderefreshes = self.controller.list_noderefreshes(label_selector)
+                    for nr in noderefreshes.get('items', []):
+                        self.events.put(('SYNC', nr))
+                    resource_version = noderefreshes['metadata']['resourceVersion']
+                    next_resync = time.time() + RESYNC_PERIOD
+                    label_selector = ACTIVE_SELECTOR
+                
+                for event in w.stream(
+                    self.custom_api.list_cluster_custom_object,
+                    group="operations.example.com",
+                    version="v1alpha1",
+                    plural="noderefreshes",
+                    label_selector=ACTIVE_SELECTOR,
+                    resource_version=resource_version,
+                    allow_watch_bookmarks=True,
+                    timeout_seconds=max(1, min(WATCH_TIMEOUT, int(next_resync - time.time())))
+                ):
+                    if self.shutdown_event.is_set():
+                        w.stop()
+                        break
+                    
+                    if event['type'] == 'ERROR':
+                        # Watch expired, start over from a fresh list
+                        resource_version = None
+                        w.stop()
+                        break
+                    
+                    resource_version = event['object']['metadata']['resourceVersion']
+                    if event['type'] != 'BOOKMARK':
+                        self.events.put((event['type'], event['object']))
+                        
+            except ApiException as e:
+                if e.status == 410:
+                    logger.info("NodeRefresh watch expired, relisting")
+                else:
+                    logger.error("Error watching NodeRefresh objects: %s", e)
+                    self.shutdown_event.wait(60)  # Wait longer on error, wake on shutdown
+                resource_version = None
+            except Exception as e:
+                logger.error("Error watching NodeRefresh objects: %s", e)
+                self.shutdown_event.wait(60)  # Wait longer on error, wake on shutdown
+    
     def run(self):
         """Main operator loop"""
         logger.info("Starting Node Refresh Operator")
@@ -48,21 +119,44 @@ class Operator:
         
         # Ensure CRD exists
         try:
-            ensure_crd_exists()
+            ensure_crd_exists(self.api_client)
             logger.info("CRD verified/created successfully")
         except Exception as e:
-            logger.error(f"Failed to ensure CRD exists: {e}")
+            logger.error("Failed to ensure CRD exists: %s", e)
             sys.exit(1)
         
+        self.controller.start()
+        
+        # Feed NodeRefresh events from a background watch
+        watcher = Thread(target=self.watch_noderefreshes, name="noderefresh-watch", daemon=True)
+        watcher.start()
+        
         # Main reconciliation loop
         while not self.shutdown_event.is_set():
             try:
-                self.controller.reconcile_all()
-                time.sleep(30)  # Check every 30 seconds
+                event_type, noderefresh = self.events.get(timeout=1)
+            except queue.Empty:
+                # Look again at objects whose restart or retry time has come
+                try:
+                    for nr in self.controller.due_requeues():
+                        self.events.put(('SYNC', nr))
+                except Exception as e:
+                    logger.error("Error fetching requeued NodeRefresh objects: %s", e)
+                continue
+            
+            if event_type == 'DELETED':
+                # Deleted, or completed and no longer matching the watch selector
+                metadata = noderefresh['metadata']
+                logger.info("NodeRefresh %s/%s no longer active", metadata['namespace'], metadata['name'])
+                self.controller.forget(noderefresh)
+                continue
+            
+            try:
+                self.controller.reconcile(noderefresh)
             except Exception as e:
-                logger.error(f"Error in reconciliation loop: {e}")
-                time.sleep(60)  # Wait longer on error
+                logger.error("Error in reconciliation loop: %s", e)
         
+        self.controller.stop()
         logger.info("Node Refresh Operator stopped gracefully")
 
 if __name__ == "__main__":
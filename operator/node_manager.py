@@ -1,66 +1,189 @@
+import functools
+import json
 import logging
+import random
+import threading
 import time
-from typing import List, Dict, Optional
+from typing import Callable, FrozenSet, List, Dict, Optional, Tuple
 
+from kubernetes import client, watch
 from kubernetes.client.rest import ApiException
+from urllib3.exceptions import HTTPError
+
+from operator.api_client import build_api_client
+from operator.informer import NODE_NAME_INDEX
 
 logger = logging.getLogger(__name__)
 
+# Seconds a node readiness result is reused
+READINESS_TTL = 2.0
+# Cap (seconds) of the backoff between failed pod watches while draining
+DRAIN_BACKOFF_CAP = 30
+
+# Asks the API server for object metadata only instead of full objects
+PARTIAL_METADATA_LIST_ACCEPT = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1"
+
+@functools.lru_cache(maxsize=128)
+def _compile_selector(selector_items: FrozenSet[Tuple[str, str]]) -> Callable[[dict], bool]:
+    """Generate a label matcher specialised to one equality selector"""
+    # repr() turns keys and values into plain string literals in the source
+    conditions = " and ".join(
+        f"labels.get({key!r}) == {value!r}" for key, value in sorted(selector_items)
+    ) or "True"
+    
+    namespace = {}
+    exec(f"def match(labels):\n    return {conditions}", namespace)
+    return namespace['match']
+
+@functools.lru_cache(maxsize=128)
+def _selector_string(selector_items: FrozenSet[Tuple[str, str]]) -> str:
+    """Join an equality selector into a label selector query string"""
+    return ",".join(f"{key}={value}" for key, value in sorted(selector_items))
+
 class NodeManager:
-    def __init__(self, core_v1):
+    def __init__(self, core_v1=None, node_cache=None, pod_cache=None, consistent_reads=False,
+                 api_client=None):
+        """core_v1 defaults to a CoreV1Api on api_client
+        
+        Pass a preconfigured api_client (see build_api_client) to share its
+        connection pool and retry settings; without one, a new client with
+        the default tuning is built.
+        """
+        if core_v1 is None:
+            core_v1 = client.CoreV1Api(api_client or build_api_client())
         self.core_v1 = core_v1
+        self.node_cache = node_cache
+        self.pod_cache = pod_cache
+        
+        # Node name -> (expiry, readiness) of recent readiness checks
+        self._readiness: Dict[str, Tuple[float, bool]] = {}
+        self._readiness_lock = threading.Lock()
+        # resourceVersion "0" serves lists from the API server's watch cache
+        # instead of a quorum read from etcd
+        self.list_kwargs = {} if consistent_reads else {'resource_version': "0"}
     
-    def find_nodes_by_selector(self, selector: Dict[str, str]) -> List[str]:
-        """Find nodes matching the given label selector"""
+    @classmethod
+    def from_api_client(cls, api_client: Optional[client.ApiClient] = None, **kwargs) -> "NodeManager":
+        """Build a NodeManager on a shared ApiClient"""
+        return cls(api_client=api_client or build_api_client(), **kwargs)
+    
+    def find_nodes_by_selector(self, selector: Optional[Dict[str, str]] = None,
+                               label_selector: Optional[str] = None) -> List[str]:
+        """Find nodes matching the given label selector
+        
+        label_selector takes a raw selector string, including set-based
+        expressions such as "role in (worker,infra),!legacy", which is
+        always evaluated by the API server.
+        """
+        use_cache = self.node_cache is not None and self.node_cache.has_synced()
+        
+        if label_selector is None:
+            selector_items = frozenset((selector or {}).items())
+            label_selector = _selector_string(selector_items)
+        else:
+            # The cached matcher only understands equality selectors
+            use_cache = False
+        
+        if use_cache:
+            match = _compile_selector(selector_items)
+            return sorted(
+                node.metadata.name for node in self.node_cache.list()
+                if match(node.metadata.labels or {})
+            )
+        
         try:
-            label_selector = ",".join([f"{k}={v}" for k, v in selector.items()])
-            nodes = self.core_v1.list_node(label_selector=label_selector)
-            return [node.metadata.name for node in nodes.items]
+            # Only names are needed, so skip node status and V1Node deserialization
+            response = self.core_v1.list_node(
+                label_selector=label_selector,
+                _headers={'Accept': PARTIAL_METADATA_LIST_ACCEPT},
+                _preload_content=False,
+                **self.list_kwargs
+            )
+            nodes = json.loads(response.data)
+            return sorted(item['metadata']['name'] for item in nodes['items'])
         except ApiException as e:
-            logger.error(f"Failed to find nodes with selector {selector}: {e}")
+            logger.error("Failed to find nodes with selector %s: %s", label_selector, e)
             return []
     
-    def is_node_ready_for_refresh(self, node_name: str) -> bool:
-        """Check if a node is ready to be refreshed"""
+    def is_node_ready_for_refresh(self, node_name: str, consistent: bool = False) -> bool:
+        """Check if a node is ready to be refreshed
+        
+        Results are reused for READINESS_TTL seconds unless the node is
+        cordoned or uncordoned in the meantime. A consistent check, such as
+        the final one before cordoning, reads the node from the API server,
+        bypassing both the node cache and reused results.
+        """
+        now = time.monotonic()
+        if not consistent:
+            with self._readiness_lock:
+                cached = self._readiness.get(node_name)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+        
         try:
-            node = self.core_v1.read_node(node_name)
-            
-            # Check node conditions
-            for condition in node.status.conditions:
-                if condition.type == "Ready" and condition.status != "True":
-                    logger.warning(f"Node {node_name} is not ready")
-                    return False
-            
-            # Check if node is already cordoned
-            if node.spec.unschedulable:
-                logger.warning(f"Node {node_name} is already cordoned")
-                return False
-            
-            return True
-            
+            node = self.core_v1.read_node(node_name) if consistent else self._get_node(node_name)
+            ready = self._node_ready_from_obj(node)
         except ApiException as e:
-            logger.error(f"Failed to check node {node_name}: {e}")
+            logger.error("Failed to check node %s: %s", node_name, e)
+            return False
+        
+        with self._readiness_lock:
+            self._readiness[node_name] = (now + READINESS_TTL, ready)
+        return ready
+    
+    def invalidate(self, node_name: str):
+        """Forget the cached readiness of a node"""
+        with self._readiness_lock:
+            self._readiness.pop(node_name, None)
+    
+    def _node_ready_from_obj(self, node) -> bool:
+        """Check if an already fetched node is ready to be refreshed"""
+        # Check node conditions
+        for condition in node.status.conditions or []:
+            if condition.type == "Ready" and condition.status != "True":
+                logger.warning("Node %s is not ready", node.metadata.name)
+                return False
+        
+        # Check if node is already cordoned
+        if node.spec.unschedulable:
+            logger.warning("Node %s is already cordoned", node.metadata.name)
             return False
+        
+        return True
     
-    def provision_replacement_node(self, original_node: str) -> Optional[str]:
-        """Provision a replacement node (simulated for this example)"""
+    def _get_node(self, node_name: str):
+        """Get a node from the cache, falling back to the API"""
+        node = None
+        if self.node_cache is not None and self.node_cache.has_synced():
+            node = self.node_cache.get(None, node_name)
+        
+        return node or self.core_v1.read_node(node_name)
+    
+    def provision_replacement_node(self, original_node: str,
+                                   selector: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Provision a replacement node (simulated for this example)
+        
+        selector restricts the candidates to nodes with the given labels,
+        such as the target selector of the refresh.
+        """
         # In a real implementation, this would call cloud provider APIs
         # to provision a new node with similar characteristics
         
-        logger.info(f"Simulating provisioning of replacement node for {original_node}")
+        logger.info("Simulating provisioning of replacement node for %s", original_node)
         
         try:
-            # Get original node info to replicate
-            original_node_info = self.core_v1.read_node(original_node)
-            
             # Simulate finding a suitable replacement node
             # In reality, you'd look for a node with capacity or provision a new one
-            all_nodes = self.core_v1.list_node()
+            # Let the API server leave out cordoned and non-matching nodes
+            all_nodes = self.core_v1.list_node(
+                field_selector="spec.unschedulable=false",
+                label_selector=_selector_string(frozenset((selector or {}).items())),
+                **self.list_kwargs
+            )
+            # The listed nodes already carry their status, no need to fetch them again
             candidate_nodes = [
-                node for node in all_nodes.items 
-                if (node.metadata.name != original_node and 
-                    not node.spec.unschedulable and
-                    self.is_node_ready_for_refresh(node.metadata.name))
+                node for node in all_nodes.items
+                if node.metadata.name != original_node and self._node_ready_from_obj(node)
             ]
             
             if candidate_nodes:
@@ -69,11 +192,11 @@ class NodeManager:
             # If no candidate found, simulate provisioning by returning a new node name
             # In reality, you'd need to integrate with your cloud provider's API
             simulated_node_name = f"replacement-for-{original_node}"
-            logger.info(f"Would provision new node: {simulated_node_name}")
+            logger.info("Would provision new node: %s", simulated_node_name)
             return simulated_node_name
             
         except ApiException as e:
-            logger.error(f"Failed to provision replacement node: {e}")
+            logger.error("Failed to provision replacement node: %s", e)
             return None
     
     def cordon_node(self, node_name: str) -> bool:
@@ -85,10 +208,11 @@ class NodeManager:
                 }
             }
             self.core_v1.patch_node(node_name, body)
-            logger.info(f"Successfully cordoned node {node_name}")
+            self.invalidate(node_name)
+            logger.info("Successfully cordoned node %s", node_name)
             return True
         except ApiException as e:
-            logger.error(f"Failed to cordon node {node_name}: {e}")
+            logger.error("Failed to cordon node %s: %s", node_name, e)
             return False
     
     def uncordon_node(self, node_name: str) -> bool:
@@ -100,10 +224,11 @@ class NodeManager:
                 }
             }
             self.core_v1.patch_node(node_name, body)
-            logger.info(f"Successfully uncordoned node {node_name}")
+            self.invalidate(node_name)
+            logger.info("Successfully uncordoned node %s", node_name)
             return True
         except ApiException as e:
-            logger.error(f"Failed to uncordon node {node_name}: {e}")
+            logger.error("Failed to uncordon node %s: %s", node_name, e)
             return False
     
     def safely_drain_node(self, node_name: str, timeout: int = 600) -> bool:
@@ -113,23 +238,97 @@ class NodeManager:
             if not self.cordon_node(node_name):
                 return False
             
-            # Wait for pods to be evacuated (simplified)
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                pods = self.core_v1.list_pod_for_all_namespaces(
-                    field_selector=f"spec.nodeName={node_name}"
-                )
-                
-                if not pods.items:
-                    logger.info(f"All pods evacuated from node {node_name}")
-                    return True
-                
-                logger.info(f"Waiting for {len(pods.items)} pods to be evacuated from {node_name}")
-                time.sleep(30)
+            if self._wait_for_evacuation(node_name, timeout):
+                logger.info("All pods evacuated from node %s", node_name)
+                return True
             
-            logger.error(f"Timeout waiting for pods to evacuate from {node_name}")
+            logger.error("Timeout waiting for pods to evacuate from %s", node_name)
             return False
             
         except ApiException as e:
-            logger.error(f"Failed to drain node {node_name}: {e}")
-            return False
\ No newline at end of file
+            logger.error("Failed to drain node %s: %s", node_name, e)
+            return False
+    
+    def _wait_for_evacuation(self, node_name: str, timeout: int) -> bool:
+        """Wait until no pods are bound to a node"""
+        if self.pod_cache is not None and self.pod_cache.has_synced():
+            # Re-checked on every pod cache change against the per-node index
+            return self.pod_cache.wait_until(
+                lambda: True if not self.pod_cache.count_by_index(NODE_NAME_INDEX, node_name) else None,
+                timeout
+            ) is not None
+        
+        # List the pods once, then follow deletions through a watch
+        field_selector = f"spec.nodeName={node_name}"
+        deadline = time.time() + timeout
+        remaining = set()
+        resource_version = None
+        failures = 0
+        
+        w = watch.Watch()
+        try:
+            while True:
+                try:
+                    if resource_version is None:
+                        pods = self.core_v1.list_pod_for_all_namespaces(
+                            field_selector=field_selector,
+                            **self.list_kwargs
+                        )
+                        remaining = {pod.metadata.uid for pod in pods.items}
+                        resource_version = pods.metadata.resource_version
+                        failures = 0
+                    
+                    if not remaining:
+                        return True
+                    
+                    seconds_left = int(deadline - time.time())
+                    if seconds_left <= 0:
+                        break
+                    
+                    logger.info("Waiting for %s pods to be evacuated from %s", len(remaining), node_name)
+                    for event in w.stream(
+                        self.core_v1.list_pod_for_all_namespaces,
+                        field_selector=field_selector,
+                        resource_version=resource_version,
+                        timeout_seconds=seconds_left
+                    ):
+                        if event['type'] == 'ERROR':
+                            # Watch expired, start over from a fresh list
+                            resource_version = None
+                            w.stop()
+                            break
+                        
+                        pod = event['object']
+                        resource_version = pod.metadata.resource_version
+                        failures = 0
+                        if event['type'] == 'DELETED':
+                            remaining.discard(pod.metadata.uid)
+                        else:
+                            remaining.add(pod.metadata.uid)
+                        
+                        if not remaining:
+                            w.stop()
+                            break
+                except (ApiException, HTTPError) as e:
+                    if isinstance(e, ApiException):
+                        if e.status == 410:
+                            # Watch expired, start over from a fresh list
+                            resource_version = None
+                            continue
+                        if e.status and 400 <= e.status < 500 and e.status != 429:
+                            raise
+                    
+                    # Back off exponentially with jitter so concurrent drains
+                    # don't retry in lockstep
+                    delay = min(DRAIN_BACKOFF_CAP, 2 ** failures)
+                    delay += random.uniform(0, 0.5 * delay)
+                    failures += 1
+                    if time.time() + delay >= deadline:
+                        break
+                    
+                    logger.warning("Error watching pods on %s, retrying in %.1fs: %s", node_name, delay, e)
+                    time.sleep(delay)
+        finally:
+            w.stop()
+        
+        return False
@@ -1,103 +1,276 @@
 import logging
-from typing import List, Dict
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, FrozenSet, NamedTuple, Optional, Tuple
 
+from kubernetes import client
 from kubernetes.client.rest import ApiException
 
+from operator.api_client import build_api_client
+from operator.informer import NAMESPACE_INDEX, NODE_NAME_INDEX
+
 logger = logging.getLogger(__name__)
 
+# Pods in these phases have finished and need no migration
+TERMINAL_POD_PHASES = ("Succeeded", "Failed")
+
+# Namespaces evicted concurrently by evict_pods
+EVICTION_CONCURRENCY = 8
+# Attempts and initial backoff (seconds) for evictions refused with 429
+EVICTION_ATTEMPTS = 5
+EVICTION_BACKOFF = 1.0
+
+class PodInfo(NamedTuple):
+    """The pod fields needed to migrate a pod and check its budgets"""
+    name: str
+    namespace: str
+    labels: Dict[str, str]
+    node_name: Optional[str]
+    phase: Optional[str]
+
+def pod_to_info(pod) -> PodInfo:
+    """Project a pod object onto the fields the operator uses"""
+    return PodInfo(
+        pod.metadata.name,
+        pod.metadata.namespace,
+        pod.metadata.labels or {},
+        pod.spec.node_name,
+        pod.status.phase
+    )
+
+class CompiledPDB:
+    """Fields of one PodDisruptionBudget read once per compliance check"""
+    
+    __slots__ = ('name', 'selector', 'expressions', 'min_healthy', 'current_healthy')
+    
+    def __init__(self, name: str, selector: frozenset,
+                 expressions: Tuple[Tuple[str, str, FrozenSet[str]], ...],
+                 min_healthy: int, current_healthy: int):
+        self.name = name
+        # matchLabels as (key, value) pairs and matchExpressions as
+        # (key, operator, values) triples
+        self.selector = selector
+        self.expressions = expressions
+        # Fewest healthy pods the budget allows after an eviction
+        self.min_healthy = min_healthy
+        self.current_healthy = current_healthy
+    
+    def matches_expressions(self, labels: Dict[str, str]) -> bool:
+        """Check a pod's labels against the matchExpressions of the selector"""
+        for key, op, values in self.expressions:
+            if op == "In":
+                if labels.get(key) not in values:
+                    return False
+            elif op == "NotIn":
+                if key in labels and labels[key] in values:
+                    return False
+            elif op == "Exists":
+                if key not in labels:
+                    return False
+            elif op == "DoesNotExist":
+                if key in labels:
+                    return False
+            # Operators unknown here are assumed to match, keeping the budget in force
+        return True
+
+def compile_pdb(pdb) -> Optional[CompiledPDB]:
+    """Compile a PDB, or return None if it can never block an eviction"""
+    spec = pdb.spec
+    # A missing selector selects no pods, an empty one (no matchLabels and
+    # no matchExpressions) selects them all
+    if spec.selector is None:
+        return None
+    if spec.min_available is None and spec.max_unavailable is None:
+        return None
+    
+    current_healthy = pdb.status.current_healthy or 0
+    desired_healthy = pdb.status.desired_healthy or 0
+    
+    # Percentages are resolved by the disruption controller into desiredHealthy
+    min_healthy = 0
+    if spec.min_available is not None:
+        min_available = spec.min_available
+        min_healthy = min_available if isinstance(min_available, int) else desired_healthy
+    if spec.max_unavailable is not None:
+        max_unavailable = spec.max_unavailable
+        floor = desired_healthy - max_unavailable if isinstance(max_unavailable, int) else desired_healthy
+        min_healthy = max(min_healthy, floor)
+    
+    return CompiledPDB(
+        pdb.metadata.name,
+        frozenset((spec.selector.match_labels or {}).items()),
+        tuple(
+            (expression.key, expression.operator, frozenset(expression.values or ()))
+            for expression in spec.selector.match_expressions or ()
+        ),
+        min_healthy,
+        current_healthy
+    )
+
 class PodManager:
-    def __init__(self, core_v1, apps_v1, policy_v1):
+    def __init__(self, core_v1, apps_v1, policy_v1, pod_cache=None, pdb_cache=None,
+                 consistent_reads=False):
         self.core_v1 = core_v1
         self.apps_v1 = apps_v1
         self.policy_v1 = policy_v1
+        self.pod_cache = pod_cache
+        self.pdb_cache = pdb_cache
+        # resourceVersion "0" serves lists from the API server's watch cache
+        self.list_kwargs = {} if consistent_reads else {'resource_version': "0"}
+        
+        # Reused by every evict_pods call
+        self.eviction_pool = ThreadPoolExecutor(max_workers=EVICTION_CONCURRENCY,
+                                                thread_name_prefix="evict")
+    
+    @classmethod
+    def from_api_client(cls, api_client: Optional[client.ApiClient] = None, **kwargs) -> "PodManager":
+        """Build a PodManager whose API groups share one ApiClient
+        
+        Sharing one client (see build_api_client) with the NodeManager and
+        the rest of the operator shares its connection pool, keep-alive
+        connections and TLS sessions.
+        """
+        api_client = api_client or build_api_client()
+        return cls(client.CoreV1Api(api_client), client.AppsV1Api(api_client),
+                   client.PolicyV1Api(api_client), **kwargs)
     
-    def get_pods_on_node(self, node_name: str) -> List[Dict]:
-        """Get all pods running on a specific node"""
+    def close(self):
+        """Stop the eviction workers"""
+        self.eviction_pool.shutdown()
+    
+    def get_pods_on_node(self, node_name: str) -> List[PodInfo]:
+        """Get all non-terminated pods on a specific node"""
+        if self.pod_cache is not None and self.pod_cache.has_synced():
+            # The node index holds PodInfo entries, projected once per pod change
+            return [pod for pod in self.pod_cache.by_index(NODE_NAME_INDEX, node_name)
+                    if pod.phase not in TERMINAL_POD_PHASES]
+        
         try:
+            # Let the API server do the filtering instead of listing every pod
             pods = self.core_v1.list_pod_for_all_namespaces(
-                field_selector=f"spec.nodeName={node_name}"
+                field_selector=f"spec.nodeName={node_name},"
+                               f"status.phase!=Succeeded,status.phase!=Failed",
+                watch=False,
+                **self.list_kwargs
             )
-            return [self._pod_to_dict(pod) for pod in pods.items]
+            return [pod_to_info(pod) for pod in pods.items]
         except ApiException as e:
-            logger.error(f"Failed to get pods on node {node_name}: {e}")
+            logger.error("Failed to get pods on node %s: %s", node_name, e)
             return []
     
-    def check_pdb_compliance(self, pods: List[Dict]) -> bool:
+    def check_pdb_compliance(self, pods: List[PodInfo]) -> bool:
         """Check if pod migration complies with Pod Disruption Budgets"""
+        pods_by_namespace = defaultdict(list)
+        for pod in pods:
+            pods_by_namespace[pod.namespace].append(pod)
+        
         try:
-            for pod in pods:
-                namespace = pod['metadata']['namespace']
-                pod_labels = pod['metadata'].get('labels', {})
-                
-                # Get all PDBs in the namespace
-                pdbs = self.policy_v1.list_namespaced_pod_disruption_budget(namespace)
+            for namespace, namespace_pods in pods_by_namespace.items():
+                # Get the namespace's PDBs once, with their fields read up front
+                compiled = self._compiled_pdbs(namespace)
                 
-                for pdb in pdbs.items:
-                    pdb_selector = pdb.spec.selector.match_labels
+                for pod in namespace_pods:
+                    pod_items = pod.labels.items()
                     
-                    # Check if this pod matches the PDB selector
-                    if all(pod_labels.get(k) == v for k, v in pdb_selector.items()):
-                        # Check if eviction would violate PDB
-                        current_healthy = pdb.status.current_healthy or 0
-                        min_available = getattr(pdb.spec, 'min_available', None)
-                        max_unavailable = getattr(pdb.spec, 'max_unavailable', None)
+                    for pdb in compiled:
+                        # Check if this pod matches the PDB selector
+                        if not pod_items >= pdb.selector:
+                            continue
+                        if pdb.expressions and not pdb.matches_expressions(pod.labels):
+                            continue
                         
-                        if min_available is not None and current_healthy - 1 < min_available:
-                            logger.warning(f"PDB violation: {pdb.metadata.name} requires min {min_available} available")
+                        # Check if eviction would violate PDB
+                        available_after = pdb.current_healthy - 1
+                        if available_after < pdb.min_healthy:
+                            logger.warning("PDB violation: %s requires min %s available, eviction leaves %s",
+                                           pdb.name, pdb.min_healthy, available_after)
                             return False
-                        
-                        if max_unavailable is not None:
-                            # Calculate current unavailable
-                            desired = pdb.status.desired_healthy or 0
-                            current_unavailable = desired - current_healthy
-                            if current_unavailable + 1 > max_unavailable:
-                                logger.warning(f"PDB violation: {pdb.metadata.name} allows max {max_unavailable} unavailable")
-                                return False
             
             return True
             
         except ApiException as e:
-            logger.error(f"Failed to check PDB compliance: {e}")
+            logger.error("Failed to check PDB compliance: %s", e)
             return False
     
+    def _compiled_pdbs(self, namespace: str) -> List[CompiledPDB]:
+        """Get a namespace's PDBs from the cache index, falling back to the API
+        
+        The cache index holds CompiledPDB entries, rebuilt only when a PDB
+        changes. PDBs that cannot block an eviction are left out.
+        """
+        if self.pdb_cache is not None and self.pdb_cache.has_synced():
+            return self.pdb_cache.by_index(NAMESPACE_INDEX, namespace)
+        
+        pdbs = self.policy_v1.list_namespaced_pod_disruption_budget(namespace)
+        return [compiled for compiled in map(compile_pdb, pdbs.items) if compiled is not None]
+    
     def evict_pod(self, pod_name: str, namespace: str) -> bool:
         """Safely evict a pod"""
         try:
-            # Using eviction API for safe pod removal
-            eviction_body = {
-                "apiVersion": "policy/v1",
-                "kind": "Eviction",
-                "metadata": {
-                    "name": pod_name,
-                    "namespace": namespace
-                }
-            }
-            
-            self.core_v1.create_namespaced_pod_eviction(
-                name=pod_name,
-                namespace=namespace,
-                body=eviction_body
-            )
-            
-            logger.info(f"Successfully evicted pod {namespace}/{pod_name}")
+            self._create_eviction(pod_name, namespace)
+            logger.info("Successfully evicted pod %s/%s", namespace, pod_name)
             return True
             
         except ApiException as e:
-            logger.error(f"Failed to evict pod {namespace}/{pod_name}: {e}")
+            logger.error("Failed to evict pod %s/%s: %s", namespace, pod_name, e)
             return False
     
-    def _pod_to_dict(self, pod) -> Dict:
-        """Convert pod object to dictionary"""
-        return {
-            'metadata': {
-                'name': pod.metadata.name,
-                'namespace': pod.metadata.namespace,
-                'labels': pod.metadata.labels or {}
-            },
-            'spec': {
-                'nodeName': pod.spec.node_name
-            },
-            'status': {
-                'phase': pod.status.phase
+    def evict_pods(self, pods: List[PodInfo]) -> Dict[str, bool]:
+        """Evict pods, returning success per "namespace/name"
+        
+        Up to EVICTION_CONCURRENCY namespaces are evicted concurrently, but
+        pods of one namespace one at a time so the API server re-evaluates
+        their PDBs between evictions.
+        """
+        pods_by_namespace = defaultdict(list)
+        for pod in pods:
+            pods_by_namespace[pod.namespace].append(pod)
+        
+        results: Dict[str, bool] = {}
+        for namespace_results in self.eviction_pool.map(self._evict_serially,
+                                                        pods_by_namespace.values()):
+            results.update(namespace_results)
+        
+        return results
+    
+    def _evict_serially(self, pods: List[PodInfo]) -> Dict[str, bool]:
+        """Evict pods one after another, backing off while evictions are refused"""
+        results = {}
+        for pod in pods:
+            key = f"{pod.namespace}/{pod.name}"
+            results[key] = False
+            
+            for attempt in range(EVICTION_ATTEMPTS):
+                try:
+                    self._create_eviction(pod.name, pod.namespace)
+                    logger.info("Successfully evicted pod %s", key)
+                    results[key] = True
+                    break
+                except ApiException as e:
+                    # 429: a PDB currently disallows the eviction, or we are throttled
+                    if e.status == 429 and attempt + 1 < EVICTION_ATTEMPTS:
+                        time.sleep(EVICTION_BACKOFF * 2 ** attempt)
+                        continue
+                    logger.error("Failed to evict pod %s: %s", key, e)
+                    break
+        
+        return results
+    
+    def _create_eviction(self, pod_name: str, namespace: str):
+        """Request an eviction of a pod, raising ApiException if refused"""
+        # Using eviction API for safe pod removal
+        eviction_body = {
+            "apiVersion": "policy/v1",
+            "kind": "Eviction",
+            "metadata": {
+                "name": pod_name,
+                "namespace": namespace
             }
-        }
\ No newline at end of file
+        }
+        
+        self.core_v1.create_namespaced_pod_eviction(
+            name=pod_name,
+            namespace=namespace,
+            body=eviction_body
+        )
@@ -0,0 +1,32 @@
+import threading
+import time
+from datetime import timedelta
+
+def exponential_backoff(failures: int, base: float = 5.0, cap: float = 1000.0) -> timedelta:
+    """Delay before the next attempt after a number of failures, doubling up to cap"""
+    # Bound the exponent; the cap is reached long before this
+    return timedelta(seconds=min(base * 2 ** min(failures, 32), cap))
+
+class TokenBucket:
+    """Token bucket allowing `rate` operations per second in bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+            return True
@@ -0,0 +1,76 @@
+import operator as _stdlib_operator
+import sys
+import types
+from pathlib import Path
+
+# Import third-party code while the stdlib operator module is still in place
+import kubernetes.client  # noqa: F401
+
+# The operator package shares its name with the stdlib module, which is
+# always imported first. Expose the package under that name, keeping the
+# stdlib functions available to anything importing operator afterwards.
+_package = types.ModuleType("operator")
+_package.__dict__.update(
+    (name, value) for name, value in vars(_stdlib_operator).items() if not name.startswith("__")
+)
+_package.__path__ = [str(Path(__file__).resolve().parent.parent / "operator")]
+sys.modules["operator"] = _package
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+from kubernetes import client
+
+class FakeAPIServer:
+    """Serves canned responses per path and records the requests it gets
+
+    A route is (status, body), or a function of the query parameters
+    returning one, where body is an object sent as JSON or a list of watch
+    events sent one JSON line each.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = dict(parse_qsl(url.query))
+                server.requests.append((url.path, query, dict(self.headers)))
+                route = server.routes.get(url.path, (404, {'kind': 'Status', 'code': 404}))
+                status, body = route(query) if callable(route) else route
+                if isinstance(body, list):
+                    payload = b"".join(json.dumps(event).encode() + b"\n" for event in body)
+                else:
+                    payload = json.dumps(body).encode()
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+@pytest.fixture
+def api_server(monkeypatch):
+    """A FakeAPIServer that build_api_client() connects to"""
+    server = FakeAPIServer()
+    thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(client.Configuration, "_default", client.Configuration(host=server.url))
+    yield server
+
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,44 @@
+from kubernetes import client, watch
+
+from operator import api_client
+from operator.api_client import build_api_client
+
+def _node(name, resource_version):
+    return {'metadata': {'name': name, 'resourceVersion': resource_version,
+                         'labels': {'pool': 'workers'}}}
+
+def test_typed_call_deserializes_models(api_server):
+    api_server.routes['/api/v1/nodes'] = (200, {
+        'kind': 'NodeList', 'metadata': {'resourceVersion': "10"},
+        'items': [_node("node-1", "9")]
+    })
+
+    nodes = client.CoreV1Api(build_api_client()).list_node()
+
+    assert isinstance(nodes, client.V1NodeList)
+    assert nodes.metadata.resource_version == "10"
+    assert nodes.items[0].metadata.name == "node-1"
+    assert nodes.items[0].metadata.labels == {'pool': 'workers'}
+
+def test_typed_call_without_orjson(api_server, monkeypatch):
+    monkeypatch.setattr(api_client, "orjson", None)
+    api_server.routes['/api/v1/nodes/node-1'] = (200, _node("node-1", "9"))
+
+    node = client.CoreV1Api(build_api_client()).read_node("node-1")
+
+    assert isinstance(node, client.V1Node)
+    assert node.metadata.name == "node-1"
+
+def test_watch_deserializes_events(api_server):
+    api_server.routes['/api/v1/nodes'] = (200, [
+        {'type': 'ADDED', 'object': _node("node-1", "11")},
+        {'type': 'BOOKMARK', 'object': {'kind': 'Node', 'metadata': {'resourceVersion': "12"}}},
+    ])
+
+    events = list(watch.Watch().stream(client.CoreV1Api(build_api_client()).list_node,
+                                       resource_version="10", timeout_seconds=1))
+
+    assert [event['type'] for event in events] == ['ADDED', 'BOOKMARK']
+    assert isinstance(events[0]['object'], client.V1Node)
+    assert events[0]['object'].metadata.name == "node-1"
+    assert events[1]['raw_object']['metadata']['resourceVersion'] == "12"
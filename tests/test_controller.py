@@ -0,0 +1,91 @@
+import copy
+import threading
+
+import pytest
+from kubernetes import client
+
+from operator.controller import PHASE_LABEL, NodeRefreshController
+
+TARGET_NODES = ["node-1", "node-2", "node-3", "node-4"]
+
+def _merge(target: dict, patch: dict):
+    """Apply a JSON merge patch in place"""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict):
+            _merge(target.setdefault(key, {}), value)
+        else:
+            target[key] = value
+
+class FakeCustomObjectsApi:
+    """Stores one NodeRefresh and records the watch event each write produces"""
+
+    def __init__(self, noderefresh: dict):
+        self.noderefresh = noderefresh
+        self.events = []
+
+    def patch_namespaced_custom_object_status(self, group, version, namespace, plural, name, body, **kwargs):
+        return self._write({'status': body['status']})
+
+    def patch_namespaced_custom_object(self, group, version, namespace, plural, name, body, **kwargs):
+        return self._write(body)
+
+    def _write(self, patch: dict) -> dict:
+        updated = copy.deepcopy(self.noderefresh)
+        _merge(updated, patch)
+
+        # Like the API server, a no-op patch keeps the resourceVersion
+        if updated != self.noderefresh:
+            metadata = updated['metadata']
+            metadata['resourceVersion'] = str(int(metadata['resourceVersion']) + 1)
+            self.noderefresh = updated
+            self.events.append(copy.deepcopy(updated))
+
+        return copy.deepcopy(self.noderefresh)
+
+class FakeNodeManager:
+    def find_nodes_by_selector(self, selector, label_selector=None):
+        return list(TARGET_NODES)
+
+@pytest.fixture
+def controller():
+    controller = NodeRefreshController("default", client.ApiClient(client.Configuration()))
+    controller.node_manager = FakeNodeManager()
+    yield controller
+    controller.stop()
+
+def test_status_then_label_writes_refresh_each_node_once(controller):
+    noderefresh = {
+        'metadata': {'name': 'refresh', 'namespace': 'default', 'generation': 1,
+                     'resourceVersion': "1", 'labels': {}},
+        'spec': {'targetNodes': {'selector': {'pool': 'workers'}, 'maxConcurrentNodes': 2}},
+        'status': {}
+    }
+    custom_api = FakeCustomObjectsApi(noderefresh)
+    controller.custom_api = custom_api
+
+    refreshes = []
+    lock = threading.Lock()
+
+    def refresh_node(name, namespace, node_name, spec):
+        with lock:
+            refreshes.append(node_name)
+            # A second refresh finds the node already cordoned
+            return refreshes.count(node_name) == 1
+
+    controller._refresh_node = refresh_node
+
+    # Reconcile every version the writes emit, in order, like the watch does
+    queue = [copy.deepcopy(noderefresh)]
+    while queue:
+        controller.reconcile(queue.pop(0))
+        queue.extend(custom_api.events)
+        custom_api.events.clear()
+
+    final = custom_api.noderefresh
+    assert sorted(refreshes) == TARGET_NODES
+    assert final['status']['phase'] == 'Completed'
+    assert sorted(final['status']['processedNodes']) == TARGET_NODES
+    assert final['status']['failedNodes'] == []
+    assert final['metadata']['labels'][PHASE_LABEL] == 'Completed'
@@ -0,0 +1,36 @@
+import logging
+
+from kubernetes import client
+
+from operator.api_client import build_api_client
+from operator.informer import ResourceCache
+
+def _node(name, resource_version):
+    return {'kind': 'Node', 'metadata': {'name': name, 'resourceVersion': resource_version}}
+
+def test_bookmarks_advance_the_watch_without_errors(api_server, caplog):
+    cache = ResourceCache(client.CoreV1Api(build_api_client()).list_node, "Node")
+    watches = []
+
+    def nodes(query):
+        if query.get('watch') != "true":
+            return 200, {'kind': 'NodeList', 'metadata': {'resourceVersion': "10"},
+                         'items': [_node("node-1", "9")]}
+
+        watches.append(query['resourceVersion'])
+        if len(watches) > 1:
+            cache.stop()
+            return 200, []
+        return 200, [
+            {'type': 'ADDED', 'object': _node("node-2", "11")},
+            {'type': 'BOOKMARK', 'object': {'kind': 'Node', 'metadata': {'resourceVersion': "12"}}},
+        ]
+
+    api_server.routes['/api/v1/nodes'] = nodes
+
+    with caplog.at_level(logging.ERROR):
+        cache._run()
+
+    assert watches == ["10", "12"]
+    assert sorted(node.metadata.name for node in cache.list()) == ["node-1", "node-2"]
+    assert not caplog.records
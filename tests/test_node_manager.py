@@ -0,0 +1,34 @@
+from operator.node_manager import PARTIAL_METADATA_LIST_ACCEPT, NodeManager
+
+def _metadata_list(*names):
+    return {
+        'kind': 'PartialObjectMetadataList', 'apiVersion': 'meta.k8s.io/v1',
+        'metadata': {'resourceVersion': "10"},
+        'items': [{'kind': 'PartialObjectMetadata', 'metadata': {'name': name}} for name in names]
+    }
+
+def test_find_nodes_without_cache_lists_metadata(api_server):
+    api_server.routes['/api/v1/nodes'] = (200, _metadata_list("node-2", "node-1"))
+
+    nodes = NodeManager().find_nodes_by_selector({'pool': 'workers', 'zone': 'a'})
+
+    assert nodes == ["node-1", "node-2"]
+    path, query, headers = api_server.requests[-1]
+    assert query == {'labelSelector': "pool=workers,zone=a", 'resourceVersion': "0"}
+    assert headers['Accept'] == PARTIAL_METADATA_LIST_ACCEPT
+
+def test_find_nodes_with_raw_selector_and_consistent_reads(api_server):
+    api_server.routes['/api/v1/nodes'] = (200, _metadata_list("infra-1"))
+
+    nodes = NodeManager(consistent_reads=True).find_nodes_by_selector(
+        label_selector="role in (worker,infra),!legacy"
+    )
+
+    assert nodes == ["infra-1"]
+    path, query, headers = api_server.requests[-1]
+    assert query == {'labelSelector': "role in (worker,infra),!legacy"}
+
+def test_find_nodes_returns_nothing_when_refused(api_server):
+    api_server.routes['/api/v1/nodes'] = (403, {'kind': 'Status', 'code': 403})
+
+    assert NodeManager().find_nodes_by_selector({'pool': 'workers'}) == []
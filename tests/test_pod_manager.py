@@ -0,0 +1,102 @@
+import threading
+import time
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from operator import pod_manager
+from operator.pod_manager import PodInfo, PodManager, compile_pdb
+
+def _pdb(name, selector, min_available=1, current_healthy=1):
+    return client.V1PodDisruptionBudget(
+        metadata=client.V1ObjectMeta(name=name, namespace="default"),
+        spec=client.V1PodDisruptionBudgetSpec(selector=selector, min_available=min_available),
+        status=client.V1PodDisruptionBudgetStatus(
+            current_healthy=current_healthy, desired_healthy=min_available,
+            disruptions_allowed=0, expected_pods=current_healthy
+        )
+    )
+
+def _pod(name, labels):
+    return PodInfo(name, "default", labels, "node-1", "Running")
+
+class FakePolicyV1Api:
+    def __init__(self, pdbs):
+        self.pdbs = pdbs
+
+    def list_namespaced_pod_disruption_budget(self, namespace):
+        return client.V1PodDisruptionBudgetList(items=self.pdbs)
+
+def _pod_manager(pdbs):
+    manager = PodManager(None, None, FakePolicyV1Api(pdbs))
+    manager.close()
+    return manager
+
+def test_match_expressions_only_select_matching_pods():
+    selector = client.V1LabelSelector(match_expressions=[
+        client.V1LabelSelectorRequirement(key="app", operator="In", values=["db"])
+    ])
+    manager = _pod_manager([_pdb("db-pdb", selector)])
+
+    assert manager.check_pdb_compliance([_pod("web-0", {"app": "web"})])
+    assert not manager.check_pdb_compliance([_pod("db-0", {"app": "db"})])
+
+def test_match_expression_operators():
+    selector = client.V1LabelSelector(match_expressions=[
+        client.V1LabelSelectorRequirement(key="tier", operator="NotIn", values=["cache"]),
+        client.V1LabelSelectorRequirement(key="app", operator="Exists"),
+        client.V1LabelSelectorRequirement(key="legacy", operator="DoesNotExist"),
+    ])
+    pdb = compile_pdb(_pdb("pdb", selector))
+
+    assert pdb.matches_expressions({"app": "db"})
+    assert pdb.matches_expressions({"app": "db", "tier": "backend"})
+    assert not pdb.matches_expressions({"app": "db", "tier": "cache"})
+    assert not pdb.matches_expressions({"tier": "backend"})
+    assert not pdb.matches_expressions({"app": "db", "legacy": "true"})
+
+def test_empty_selector_selects_every_pod_and_missing_selector_none():
+    assert not _pod_manager([_pdb("all", client.V1LabelSelector())]).check_pdb_compliance(
+        [_pod("any-0", {"app": "any"})]
+    )
+    assert compile_pdb(_pdb("none", None)) is None
+
+class FakeCoreV1Api:
+    """Records evictions, refusing the first attempt of some pods with 429"""
+
+    def __init__(self, refuse_once=()):
+        self.refuse_once = set(refuse_once)
+        self.active = {}
+        self.overlapping = []
+        self.evicted = []
+        self.lock = threading.Lock()
+
+    def create_namespaced_pod_eviction(self, name, namespace, body):
+        with self.lock:
+            if self.active.get(namespace):
+                self.overlapping.append(namespace)
+            self.active[namespace] = True
+        try:
+            time.sleep(0.01)
+            if name in self.refuse_once:
+                self.refuse_once.discard(name)
+                raise ApiException(status=429)
+            self.evicted.append(f"{namespace}/{name}")
+        finally:
+            with self.lock:
+                self.active[namespace] = False
+
+def test_evict_pods_serializes_per_namespace_and_retries_429(monkeypatch):
+    monkeypatch.setattr(pod_manager, "EVICTION_BACKOFF", 0)
+    core_v1 = FakeCoreV1Api(refuse_once={"a-1"})
+    manager = PodManager(core_v1, None, None)
+
+    pods = [PodInfo(f"{ns}-{i}", ns, {}, "node-1", "Running") for ns in ("a", "b") for i in range(3)]
+    try:
+        results = manager.evict_pods(pods)
+    finally:
+        manager.close()
+
+    assert results == {f"{pod.namespace}/{pod.name}": True for pod in pods}
+    assert core_v1.overlapping == []
+    assert sorted(core_v1.evicted) == sorted(results)